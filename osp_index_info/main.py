@@ -8,13 +8,55 @@ import subprocess
 import os
 import sys
 import typing as t
+import types
 import tempfile
-from functools import cache, cached_property
-from urllib.request import urlopen
+import tarfile
+import io
+import codecs
+import threading
+import gzip
+import hashlib
+import base64
+import http.client
+import time
+import email.utils
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
+import urllib.request
+from urllib.parse import urlsplit, urljoin, unquote
 from urllib.error import HTTPError
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj: t.Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    def json_print(obj: t.Any, indent: bool = False):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(json_dumps(obj, indent) + b"\n")
+except ImportError:
+    json_loads = json.loads
+
+    # Matches orjson's output byte for byte: compact separators unless indented, and raw UTF-8 rather than \u escapes
+    def _json_kwargs(indent: bool) -> dict[str, t.Any]:
+        return {"indent": 2 if indent else None, "separators": None if indent else (",", ":"), "ensure_ascii": False}
+
+    def json_dumps(obj: t.Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, **_json_kwargs(indent)).encode()
+
+    def json_print(obj: t.Any, indent: bool = False):
+        # json.dump writes the encoded chunks as it goes instead of building the whole document first
+        sys.stdout.flush()
+        out = codecs.getwriter("utf-8")(sys.stdout.buffer)
+        json.dump(obj, out, **_json_kwargs(indent))
+        out.write("\n")
+        out.flush()
+
 # TODO: This should be coming from the upstream-vcs-location label, if present
-IMAGE_REPO_TO_GIT_REPO = {
+IMAGE_REPO_TO_GIT_REPO = types.MappingProxyType({
     "pipelines-cache-rhel9": "openshift-pipelines/tekton-caches",
     "pipelines-chains-controller-rhel9": "tektoncd/chains",
     "pipelines-cli-tkn-rhel9": "tektoncd/cli",
@@ -50,92 +92,412 @@ IMAGE_REPO_TO_GIT_REPO = {
     "pipelines-triggers-webhook-rhel9": "tektoncd/triggers",
     "pipelines-webhook-rhel9": "tektoncd/pipeline",
     "pipelines-workingdirinit-rhel9": "tektoncd/pipeline",
-}
+})
+# Interning the keys (and the parsed image repos) lets lookups succeed on an identity check
+_PIPELINES_REPOS: frozenset[str] = frozenset(map(sys.intern, IMAGE_REPO_TO_GIT_REPO))
 
 
 def stderr(msg: str):
-    print(msg, file=os.stderr)
+    print(msg, file=sys.stderr)
 
 
 logger = logging.getLogger(os.path.basename(sys.argv[0]))
 
-pulled_images = []
+
+def _run_quiet(cmd: list[str]):
+    # For commands whose output isn't used: discard stdout instead of capturing and decoding it
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    except subprocess.CalledProcessError as e:
+        e.stderr = e.stderr.decode(errors="replace")
+        raise
+
+
+def podman_read_file(container_id: str, path: str) -> bytes:
+    # With "-" as the destination, podman cp writes a tar archive of the path to stdout
+    try:
+        cmd = subprocess.run(["podman", "cp", f"{container_id}:{path}", "-"], capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        e.stderr = e.stderr.decode(errors="replace")
+        raise
+    with tarfile.open(fileobj=io.BytesIO(cmd.stdout)) as archive:
+        if (contents := archive.extractfile(os.path.basename(path))) is None:
+            raise FileNotFoundError(f"{path} in container {container_id} is not a regular file")
+        return contents.read()
+
+
+# Matches podman's default image_parallel_copies; more concurrent podman processes mostly just contend for the same storage
+PODMAN_WORKERS = 8
+GITHUB_WORKERS = 16
+
+
+def run_concurrently(func: t.Callable[[t.Any], t.Any], items: t.Iterable[t.Any], max_workers: int):
+    # For warming per-item caches: the work is podman subprocesses and HTTP requests, which release the GIL.
+    # Exceptions are left for the caller to hit again (and handle) when it reads the result.
+    items = list(items)
+    if not items:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        wait([executor.submit(func, i) for i in items])
+
+
+# Cleared by --no-cache: cached data is ignored, but fresh results are still written back
+read_cache = True
+
+
+def cache_dir(*parts: str) -> str:
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tekshift", *parts)
+
+
+def _read_cache_file(path: str) -> bytes | None:
+    if not read_cache:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_cache_file(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)
+
+
+GITHUB_RATE_LIMIT_RETRIES = 4
+# Rate limits that ask for a longer wait (Retry-After or X-RateLimit-Reset) fail straight away instead
+GITHUB_RATE_LIMIT_MAX_WAIT = 60
+
+# HTTPSConnection isn't thread safe, so keep one keep-alive connection per thread and host
+_connections = threading.local()
+
+
+def _connection(host: str) -> http.client.HTTPSConnection:
+    if not hasattr(_connections, "by_host"):
+        _connections.by_host = {}
+    if host not in _connections.by_host:
+        # honour https_proxy/no_proxy the way urlopen would, by tunnelling through the proxy
+        proxy = urllib.request.getproxies().get("https")
+        if proxy and not urllib.request.proxy_bypass(host):
+            proxy_url = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            conn = http.client.HTTPSConnection(proxy_url.hostname, proxy_url.port, timeout=60)
+            tunnel_headers = {}
+            if proxy_url.username:
+                credentials = f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+                tunnel_headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+            conn.set_tunnel(host, headers=tunnel_headers)
+        else:
+            conn = http.client.HTTPSConnection(host, timeout=60)
+        _connections.by_host[host] = conn
+    return _connections.by_host[host]
+
+
+# GitHub answers with a redirect for renamed and transferred repositories
+_REDIRECT_STATUSES = frozenset((301, 302, 307, 308))
+MAX_REDIRECTS = 5
+
+
+def _get(url: str, headers: dict[str, str]) -> tuple[http.client.HTTPResponse, bytes]:
+    for _ in range(MAX_REDIRECTS + 1):
+        logger.debug(f"GET {url}")
+        split_url = urlsplit(url)
+        path = f"{split_url.path}?{split_url.query}" if split_url.query else split_url.path
+        conn = _connection(split_url.netloc)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            # the server may have closed the kept-alive connection, so retry once on a fresh one
+            conn.close()
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        body = resp.read()
+        if resp.status not in _REDIRECT_STATUSES or not (location := resp.getheader("Location")):
+            return resp, body
+        redirect_url = urljoin(url, location)
+        if urlsplit(redirect_url).netloc != split_url.netloc:
+            # don't hand the token to another host
+            headers = {k: v for k, v in headers.items() if k != "Authorization"}
+        url = redirect_url
+    raise HTTPError(url, resp.status, f"too many redirects ({MAX_REDIRECTS})", resp.headers, None)
+
+
+def _rate_limit_delay(resp: http.client.HTTPResponse, attempt: int) -> int | None:
+    # Seconds to wait before retrying, or None if the response isn't worth retrying
+    if resp.status not in (403, 429):
+        return None
+    if retry_after := resp.getheader("Retry-After"):
+        # either a number of seconds or an HTTP date
+        try:
+            wait_for = int(retry_after)
+        except ValueError:
+            try:
+                wait_for = int(email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()) + 1
+            except (TypeError, ValueError):
+                return None
+    elif resp.getheader("X-RateLimit-Remaining") == "0":
+        # The primary rate limit only resets at X-RateLimit-Reset, which can be up to an hour away
+        try:
+            wait_for = int(resp.getheader("X-RateLimit-Reset") or "") - int(time.time()) + 1
+        except ValueError:
+            return None
+    else:
+        # secondary rate limits don't always say how long to wait
+        return 2 ** attempt if resp.status == 429 else None
+    return max(wait_for, 1) if wait_for <= GITHUB_RATE_LIMIT_MAX_WAIT else None
+
+
+def github_get(url: str, cache_name: str | None = None) -> t.Any:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
+        "User-Agent": "osp-index-info",
+    }
+    if token := os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"token {token}"
+
+    cache_file = None
+    cached = None
+    if cache_name:
+        cache_file = cache_dir(cache_name, f"{hashlib.sha256(url.encode()).hexdigest()}.json.gz")
+        try:
+            if (data := _read_cache_file(cache_file)) is not None:
+                cached = json_loads(gzip.decompress(data))
+                headers["If-None-Match"] = cached["etag"]
+        except (OSError, EOFError, ValueError, KeyError):
+            cached = None
+
+    for attempt in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+        resp, body = _get(url, headers)
+        if attempt == GITHUB_RATE_LIMIT_RETRIES or (delay := _rate_limit_delay(resp, attempt)) is None:
+            break
+        logger.warning(f"rate limited fetching {url}, retrying in {delay}s")
+        time.sleep(delay)
+
+    if resp.status == 304 and cached is not None:
+        logger.debug(f"using cached response for {url}")
+        return cached["body"]
+    if resp.status != 200:
+        raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    if resp.getheader("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    data = json_loads(body)
+
+    if cache_file and (etag := resp.getheader("ETag")):
+        try:
+            _write_cache_file(cache_file, gzip.compress(json_dumps({"etag": etag, "body": data})))
+        except OSError as e:
+            logger.debug(f"error caching response for {url}: {e}")
+    return data
+
+_present_refs: set[str] = set()
 created_images = []
+_images_lock = threading.Lock()
+# Mounting images needs a local, rootful podman; set to False on the first failure so other images go straight to a container
+_image_mount_supported = os.geteuid() == 0
+
+
+_UNSET = object()
+
+# [registry[:port]/][namespace/]repo[:tag][@algorithm:digest]
+_IMAGE_REF_RE = re.compile(r"^(?:.+/)?(?P<repo>[^/@:]+)(?::[^/@]+)?(?:@(?:[^:@]+:)?(?P<digest>[^@]+))?$")
 
 
 class Image:
+    __slots__ = ("image_ref", "image_repo", "image_digest", "code_repo", "_lock", "_container_id", "_mountpoint", "_cached_labels", "_disk_cache_data", "_upstream_commit", "_exists")
+
     image_ref: str
     image_repo: str
-    image_digest: str
-    code_repo: str | None = None
-    _container_id: str | None = None
+    image_digest: str | None
+    code_repo: str | None
+    _container_id: str | None
+    _mountpoint: str | None
+    _cached_labels: dict[str, str] | None
+    _disk_cache_data: dict[str, t.Any] | None
+    _upstream_commit: t.Any
+    _exists: bool | None
+
+    # Bundles (including the old and new bundles in a comparison) share most of their images, so share the
+    # Image objects and the podman work behind them as well
+    _registry: t.ClassVar[dict[str, "Image"]] = {}
+    _registry_lock: t.ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(self, image_ref: str):
-        # TODO: add better handling for tags, tag+digest, and invalid image formats
+        # TODO: add better handling for invalid image formats
         self.image_ref = image_ref
-        image_repo_full = image_ref.split("@")[0]
-        self.image_repo = image_repo_full.split("/")[-1]
-
-        colon_parts = image_ref.split(":")
-        if len(colon_parts) > 1:
-            self.image_digest = colon_parts[1]
+        self._lock = threading.RLock()
+        self._container_id = None
+        self._mountpoint = None
+        self._cached_labels = None
+        self._disk_cache_data = None
+        self._upstream_commit = _UNSET
+        self._exists = None
+
+        if match := _IMAGE_REF_RE.match(image_ref):
+            self.image_repo = sys.intern(match["repo"])
+            self.image_digest = match["digest"]
         else:
+            self.image_repo = image_ref
             self.image_digest = None
 
         self.code_repo = IMAGE_REPO_TO_GIT_REPO.get(self.image_repo)
 
+    @classmethod
+    def get(cls, image_ref: str) -> t.Self:
+        with cls._registry_lock:
+            if image_ref not in cls._registry:
+                cls._registry[image_ref] = cls(image_ref)
+            return cls._registry[image_ref]
+
     def is_pipelines_maintained(self) -> bool:
-        return self.image_repo in IMAGE_REPO_TO_GIT_REPO.keys()
+        return self.image_repo in _PIPELINES_REPOS
 
     def _pull(self):
-        if self.image_ref in pulled_images:
-            logger.warning(f"image {self.image_ref} pulled more than once")
-        try:
-            logger.debug(f"pulling image {self.image_ref}")
-            subprocess.run(["podman", "exists", self.image_ref], capture_output=True, text=True, check=True)
-        except subprocess.CalledProcessError:
-            subprocess.run(["podman", "pull", "-q", self.image_ref], capture_output=True, text=True, check=True)
+        with self._lock:
+            with _images_lock:
+                if self.image_ref in _present_refs:
+                    return
+            try:
+                logger.debug(f"pulling image {self.image_ref}")
+                _run_quiet(["podman", "image", "exists", self.image_ref])
+            except subprocess.CalledProcessError:
+                _run_quiet(["podman", "pull", "-q", self.image_ref])
+            with _images_lock:
+                _present_refs.add(self.image_ref)
+
+    def _disk_cache_path(self) -> str | None:
+        # Only a ref pinned by digest is immutable, tags can be moved to a different image
+        if "@" not in self.image_ref or not self.image_digest:
+            return None
+        return cache_dir("images", f"{self.image_digest}.json")
+
+    def _disk_cache(self) -> dict[str, t.Any]:
+        with self._lock:
+            if self._disk_cache_data is None:
+                self._disk_cache_data = {}
+                if (path := self._disk_cache_path()) and (data := _read_cache_file(path)) is not None:
+                    try:
+                        self._disk_cache_data = json_loads(data)
+                    except ValueError:
+                        pass
+            return self._disk_cache_data
+
+    def _store(self, key: str, value: t.Any):
+        with self._lock:
+            self._disk_cache()[key] = value
+            if path := self._disk_cache_path():
+                try:
+                    _write_cache_file(path, json_dumps(self._disk_cache_data))
+                except OSError as e:
+                    logger.debug(f"error caching info for {self.image_ref}: {e}")
+
+    def _has_labels(self) -> bool:
+        with self._lock:
+            if self._cached_labels is None and "labels" in self._disk_cache():
+                self._cached_labels = self._disk_cache()["labels"]
+            return self._cached_labels is not None
+
+    def _set_labels(self, labels: dict[str, str]):
+        with self._lock:
+            self._cached_labels = labels
+            self._store("labels", labels)
 
-    @cache
     def _labels(self) -> dict[str, str]:
+        with self._lock:
+            if not self._has_labels():
+                if (labels := self._inspect_labels()) is not None:
+                    self._set_labels(labels)
+                else:
+                    self._cached_labels = {}
+            return self._cached_labels
+
+    def _inspect_labels(self) -> dict[str, str] | None:
+        inspect = ["podman", "image", "inspect", "--format", "{{json .Config.Labels}}", self.image_ref]
         try:
-            self._pull()
-            cmd = subprocess.run(["podman", "inspect", self.image_ref], capture_output=True, text=True, check=True)
-            inspected_containers = json.loads(cmd.stdout)
-            if len(inspected_containers) != 1:
-                return {}
-            return inspected_containers[0].get("Config", {}).get("Labels", {})
+            # Most images are already local, so inspect first and only pull when that fails instead of checking beforehand
+            cmd = subprocess.run(inspect, capture_output=True, text=True)
+            if cmd.returncode != 0:
+                logger.debug(f"pulling image {self.image_ref}")
+                _run_quiet(["podman", "pull", "-q", self.image_ref])
+                cmd = subprocess.run(inspect, capture_output=True, text=True, check=True)
         except subprocess.CalledProcessError:
             logger.exception(f"error inspecting image {self.image_ref}")
-            return {}
+            return None
+        with _images_lock:
+            _present_refs.add(self.image_ref)
+        return json_loads(cmd.stdout) or {}
 
-    @cache
     def _get_container_id(self):
-        if self.image_ref in created_images:
-            logger.warning(f"image {self.image_ref} created more than once")
-        logger.debug(f"creating container for image {self.image_ref}")
-        cmd = subprocess.run(["podman", "create", "-q", self.image_ref], capture_output=True, text=True, check=True)
-        self._container_id = str(cmd.stdout).strip()
-        return self._container_id
-
-    @cache
+        with self._lock:
+            if self._container_id is not None:
+                return self._container_id
+            with _images_lock:
+                if self.image_ref in created_images:
+                    logger.warning(f"image {self.image_ref} created more than once")
+                created_images.append(self.image_ref)
+            logger.debug(f"creating container for image {self.image_ref}")
+            cmd = subprocess.run(["podman", "create", "--pull=missing", "-q", self.image_ref], capture_output=True, text=True, check=True)
+            self._container_id = str(cmd.stdout).strip()
+            with _images_lock:
+                _present_refs.add(self.image_ref)
+            return self._container_id
+
+    def _mount(self) -> str | None:
+        global _image_mount_supported
+        with self._lock:
+            if self._mountpoint is not None or not _image_mount_supported:
+                return self._mountpoint
+            self._pull()
+            try:
+                cmd = subprocess.run(["podman", "image", "mount", self.image_ref], capture_output=True, text=True, check=True)
+            except subprocess.CalledProcessError as err:
+                logger.debug(f"error mounting image {self.image_ref}, falling back to containers: {err.stderr.strip()}")
+                _image_mount_supported = False
+                return None
+            self._mountpoint = cmd.stdout.strip()
+            return self._mountpoint
+
+    def _read_mounted_head(self) -> t.Any:
+        # Returns _UNSET when the image can't be mounted, otherwise the HEAD file contents or None if there isn't one
+        if (mountpoint := self._mount()) is None:
+            return _UNSET
+        try:
+            with open(os.path.join(mountpoint, "kodata", "HEAD")) as head:
+                return head.read().strip()
+        except FileNotFoundError:
+            logger.debug(f"no head file in {self.image_repo}")
+            return None
+
     def downstream_commit(self) -> str | None:
         return self._labels().get("vcs-ref")
 
-    @cache
     def upstream_commit(self) -> str | None:
+        with self._lock:
+            if self._upstream_commit is _UNSET:
+                self._upstream_commit = self._find_upstream_commit()
+            return self._upstream_commit
+
+    def _find_upstream_commit(self) -> str | None:
         logger.debug(f"fetching upstream commit for {self.image_ref}")
         if upstream_commit := self._labels().get("upstream-vcs-ref"):
             return upstream_commit
+        if "upstream_commit" in self._disk_cache():
+            return self._disk_cache()["upstream_commit"]
         try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                outfile = f"{tmpdir}/{self.image_repo}_head"
-                subprocess.run(["podman", "cp", f"{self._get_container_id()}:/kodata/HEAD", outfile], capture_output=True, check=True, text=True)
-                with open(outfile) as head:
-                    return str(head.read()).strip()
+            if (upstream_commit := self._read_mounted_head()) is not _UNSET:
+                self._store("upstream_commit", upstream_commit)
+                return upstream_commit
+            upstream_commit = podman_read_file(self._get_container_id(), "/kodata/HEAD").decode().strip()
+            self._store("upstream_commit", upstream_commit)
+            return upstream_commit
         except subprocess.CalledProcessError as err:
             logger.debug(f"error extracting head file for {self.image_repo}: {err.stderr.strip()}")
             return None
+        except (KeyError, FileNotFoundError) as err:
+            logger.debug(f"error extracting head file for {self.image_repo}: {err}")
+            return None
 
     def as_dict(self, show_info: bool) -> dict:
         d = {"image": self.image_ref}
@@ -153,17 +515,79 @@ class Image:
         if self.code_repo and self.upstream_commit():
             return f"github.com/{self.code_repo}/commit/{self.upstream_commit()}"
 
-    @cache
     def exists(self) -> bool:
-        try:
-            self._pull()
-        except subprocess.CalledProcessError:
-            return False
-        return True
+        # Checks the registry rather than local storage: an image that was only ever built or pulled locally doesn't count.
+        # Only the manifest is fetched, rather than pulling every layer of the image.
+        if self._exists is None:
+            try:
+                logger.debug(f"checking registry for image {self.image_ref}")
+                _run_quiet(["podman", "manifest", "inspect", self.image_ref])
+                self._exists = True
+            except subprocess.CalledProcessError as err:
+                logger.debug(f"image {self.image_ref} not found: {err.stderr.strip()}")
+                self._exists = False
+        return self._exists
 
     def clean(self):
-        if self._container_id is not None:
-            subprocess.run(["podman", "container", "rm", self._container_id], capture_output=True, text=True, check=True)
+        clean_images([self])
+
+
+def clean_images(images: t.Iterable[Image], container_ids: t.Iterable[str] = ()):
+    # podman takes any number of containers/images per call, so tear everything down with at most two commands
+    images = list(images)
+    container_ids = [*container_ids, *(i._container_id for i in images if i._container_id is not None)]
+    mounted_refs = [i.image_ref for i in images if i._mountpoint is not None]
+    if container_ids:
+        _run_quiet(["podman", "container", "rm", "-f", *container_ids])
+    if mounted_refs:
+        _run_quiet(["podman", "image", "unmount", *mounted_refs])
+    for image in images:
+        image._container_id = None
+        image._mountpoint = None
+
+
+# Just the fields needed to match images back to the requested refs and their labels, one tab-separated line per image
+_INSPECT_LABELS_FORMAT = "{{json .RepoDigests}}\t{{json .RepoTags}}\t{{json .Config.Labels}}"
+
+
+def inspect_labels(image_refs: t.Iterable[str]) -> dict[str, dict[str, str]]:
+    refs = set(image_refs)
+    logger.debug(f"inspecting {len(refs)} images")
+    # podman still prints the images it found when some of the refs are missing, so don't check the exit code
+    cmd = subprocess.run(["podman", "image", "inspect", "--format", _INSPECT_LABELS_FORMAT, *refs], capture_output=True, text=True)
+    if cmd.returncode != 0:
+        logger.debug(f"error inspecting images: {cmd.stderr.strip()}")
+
+    labels = {}
+    for line in cmd.stdout.splitlines():
+        try:
+            repo_digests, repo_tags, image_labels = (json_loads(field) for field in line.split("\t"))
+        except ValueError:
+            logger.debug(f"unexpected podman inspect output: {line}")
+            continue
+        for name in (repo_digests or []) + (repo_tags or []):
+            if name in refs:
+                labels[name] = image_labels or {}
+    with _images_lock:
+        _present_refs.update(labels)
+    return labels
+
+
+def prefetch_labels(images: t.Iterable[Image]):
+    # One `podman inspect` for all the images instead of one per image; anything not
+    # resolved here falls back to the per-image path in Image._labels
+    pending = {i.image_ref: i for i in images if not i._has_labels()}
+    if not pending:
+        return
+    labels = inspect_labels(pending)
+    if missing := [ref for ref in pending if ref not in labels]:
+        logger.debug(f"pulling {len(missing)} missing images")
+        cmd = subprocess.run(["podman", "pull", "-q", *missing], capture_output=True, text=True)
+        if cmd.returncode != 0:
+            logger.debug(f"error pulling images: {cmd.stderr.strip()}")
+        labels |= inspect_labels(missing)
+    for ref, image_labels in labels.items():
+        pending[ref]._set_labels(image_labels)
 
 
 class Bundle:
@@ -176,9 +600,14 @@ class Bundle:
 
     @cached_property
     def images(self) -> list[Image]:
-        image_list = [i.get("image") for i in self.data.get("relatedImages", []) if i.get("image") and i.get("name")]
-        return [Image(i) for i in set(image_list)]
+        images: dict[str, Image] = {}
+        for related_image in self.data.get("relatedImages", []):
+            ref = related_image.get("image")
+            if ref and related_image.get("name") and ref not in images:
+                images[ref] = Image.get(ref)
+        return list(images.values())
 
+    @cached_property
     def version(self) -> str:
         properties = self.data.get("properties", [])
         package_properties = [p for p in properties if p.get("type") == "olm.package" and p.get("value", {}).get("packageName") == "openshift-pipelines-operator-rh"]
@@ -186,30 +615,83 @@ class Bundle:
             return "No version found"
         return package_properties[0].get("value", {}).get("version", "")
 
+    def prefetch(self):
+        # downstream_commit only reads the labels, so after the batched inspect only the upstream commits are left to fan out
+        prefetch_labels(self.images)
+        run_concurrently(Image.upstream_commit, self.images, PODMAN_WORKERS)
+
     def as_dict(self, show_info: bool = False) -> dict[str, dict[t.Any, t.Any]]:
+        if show_info:
+            self.prefetch()
         return {
-            "version": self.version(),
+            "version": self.version,
             "images": {i.image_repo: i.as_dict(show_info=show_info) for i in self.images},
         }
 
     def clean(self):
-        for image in self.images:
-            image.clean()
+        clean_images(self.images)
 
     def validate_images(self) -> str:
+        run_concurrently(Image.exists, self.images, PODMAN_WORKERS)
         if invalid_images := [image for image in self.images if not image.exists()]:
             return "Missing images:\n\t" + "\n\t".join(i.image_ref for i in invalid_images)
         return "All images reachable"
 
 
+_WHITESPACE = re.compile(r"\s*")
+
+
+def iter_json_objects(data: str) -> t.Iterator[t.Any]:
+    # catalog.json is a stream of concatenated JSON objects rather than a single document
+    decoder = json.JSONDecoder()
+    idx = _WHITESPACE.match(data).end()
+    count = 0
+    while idx < len(data):
+        try:
+            obj, idx = decoder.raw_decode(data, idx)
+        except json.JSONDecodeError as e:
+            stderr(f"error parsing object {count} (line {e.lineno}, column {e.colno}):\n{data[idx:e.pos + 1]}")
+            raise
+        yield obj
+        count += 1
+        idx = _WHITESPACE.match(data, idx).end()
+
+
 class Catalog:
     def __init__(self, image: str):
-        self._bundles: list[Bundle] = []
+        # Bundles are only created for the entries that are actually used, so clean() doesn't touch the rest
+        self._bundles: dict[str, Bundle] = {}
         self.container_id: None | str = None
         self.image = image
-        self.entries = self._pull_data()
+        self.entries: list[dict[str, t.Any]] = []
+        self._channel_entries: list[dict[str, t.Any]] = []
+        self._bundle_entries: list[dict[str, t.Any]] = []
+
+        # Sort the entries by schema as they're decoded rather than in a second pass
+        for e in self._pull_data():
+            self.entries.append(e)
+            match e.get("schema"):
+                case "olm.channel":
+                    self._channel_entries.append(e)
+                case "olm.bundle":
+                    self._bundle_entries.append(e)
+
+    def _cache_path(self) -> str | None:
+        # Like images, only a catalog pinned by digest can be cached
+        if "@" in self.image and (match := _IMAGE_REF_RE.match(self.image)) and match["digest"]:
+            return cache_dir("catalogs", f"{match['digest']}.json.gz")
+        return None
+
+    def _pull_data(self) -> t.Iterator[dict[str, t.Any]]:
+        cache_file = self._cache_path()
+        if cache_file and (cached := _read_cache_file(cache_file)) is not None:
+            try:
+                catalog_json = gzip.decompress(cached)
+                logger.debug(f"using cached catalog for {self.image}")
+                return iter_json_objects(catalog_json.decode())
+            except (OSError, EOFError):
+                logger.debug(f"ignoring unreadable cached catalog {cache_file}")
 
-    def _pull_data(self) -> list:
         try:
             container_id = subprocess.run(["podman", "create", "-q", self.image], capture_output=True, text=True, check=True).stdout
         except subprocess.CalledProcessError as e:
@@ -217,44 +699,83 @@ class Catalog:
 
         self.container_id = str(container_id.strip())
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            outfile = f"{tmpdir}/catalog.json"
-            subprocess.run(["podman", "cp", f"{self.container_id}:/configs/openshift-pipelines-operator-rh/catalog.json", outfile], check=True)
-            with open(outfile) as catalog:
-                catalog_json = catalog.read()
-                objects = re.findall(r'\n(\{.*?\n\})', catalog_json, re.DOTALL)
-                try:
-                    return [json.loads(o) for o in objects]
-                except Exception as e:
-                    for o in objects:
-                        try:
-                            json.loads(o)
-                        except:
-                            stderr(o)
-                            raise e
+        try:
+            catalog_json = podman_read_file(self.container_id, "/configs/openshift-pipelines-operator-rh/catalog.json")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"error copying catalog.json from '{self.image}':\n---\n{e.stderr}") from e
 
+        if cache_file:
+            try:
+                _write_cache_file(cache_file, gzip.compress(catalog_json))
+            except OSError as e:
+                logger.debug(f"error caching catalog {self.image}: {e}")
+        return iter_json_objects(catalog_json.decode())
+
+    @cached_property
     def release_channels(self) -> dict[str, list[dict[str, t.Any]]]:
-        return {e.get("name"): e.get("entries") for e in self.entries if e.get("schema") == "olm.channel"}
+        return {e.get("name"): e.get("entries") for e in self._channel_entries}
+
+    def _bundle(self, entry: dict[str, t.Any]) -> Bundle:
+        name = entry.get("name")
+        if name not in self._bundles:
+            self._bundles[name] = Bundle(entry)
+        return self._bundles[name]
 
     def bundles(self) -> list[Bundle]:
-        if not self._bundles:
-            self._bundles = [Bundle(e) for e in self.entries if e.get("schema") == "olm.bundle"]
-        return self._bundles
+        return [self._bundle(e) for e in self._bundle_entries]
 
     def clean(self):
-        if self.container_id is not None:
-            subprocess.run(["podman", "container", "rm", self.container_id], capture_output=True, text=True, check=True)
-        for entry in self.bundles():
-            entry.clean()
+        container_ids = [self.container_id] if self.container_id is not None else []
+        clean_images((image for bundle in self._bundles.values() for image in bundle.images), container_ids)
+        self.container_id = None
+
+    @cached_property
+    def _bundle_entries_by_name(self) -> dict[str, dict[str, t.Any]]:
+        return {e.get("name"): e for e in self._bundle_entries}
 
     def get_bundle(self, name: str) -> Bundle:
-        bundle_names = [b.name for b in self.bundles()]
-        matching_bundles = list(b for b in self.bundles() if b.name.startswith(name))
-        if len(matching_bundles) == 0:
-            raise Exception(f"No bundle found with name {name}. Bundles: {bundle_names}")
-        if len(matching_bundles) > 1:
-            raise Exception("Cannot select Bundle from ambiguous name {name}. Found {len(matching_bundles} matches")
-        return matching_bundles[0]
+        if entry := self._bundle_entries_by_name.get(name):
+            return self._bundle(entry)
+        matching_entries = [e for e in self._bundle_entries if e.get("name", "").startswith(name)]
+        if len(matching_entries) == 1:
+            return self._bundle(matching_entries[0])
+        if not matching_entries:
+            raise Exception(f"No bundle found with name {name}. Bundles: {list(self._bundle_entries_by_name)}")
+        raise Exception(f"Cannot select Bundle from ambiguous name {name}. Found {len(matching_entries)} matches")
+
+
+# Commit dates by (repo, sha), None if GitHub couldn't find the commit
+_commit_dates: dict[tuple[str, str], str | None] = {}
+
+
+def get_commit_date(repo: str, sha: str) -> str | None:
+    if (repo, sha) in _commit_dates:
+        return _commit_dates[(repo, sha)]
+
+    # A commit's date never changes, so found dates are also kept on disk
+    cache_file = cache_dir("commits", repo, f"{sha}.json")
+    if (cached := _read_cache_file(cache_file)) is not None:
+        try:
+            _commit_dates[(repo, sha)] = json_loads(cached)
+            return _commit_dates[(repo, sha)]
+        except ValueError:
+            pass
+
+    url = f"https://api.github.com/repos/{repo}/commits/{sha}"
+    logger.debug(f"Fetching commit data from {url}")
+    try:
+        resp = github_get(url)
+    except HTTPError:
+        _commit_dates[(repo, sha)] = None
+        return None
+    date = resp.get("commit", {}).get("committer", {}).get("date", "")
+    _commit_dates[(repo, sha)] = date
+    if date:
+        try:
+            _write_cache_file(cache_file, json_dumps(date))
+        except OSError as e:
+            logger.debug(f"error caching commit date for {repo}@{sha}: {e}")
+    return date
 
 
 class RepoChange:
@@ -280,15 +801,10 @@ class RepoChange:
 
         if self.git_repo and self.old_revision and self.new_revision:
             def commit_date(sha: str) -> str:
-                url = f"https://api.github.com/repos/{self.git_repo}/commits/{sha}"
-                logger.debug(f"Fetching commit data from {url}")
-                try:
-                    with urlopen(url) as r:
-                        resp = json.load(r)
-                        return resp.get("commit", {}).get("committer", {}).get("date", "")
-                except HTTPError:
+                if (date := get_commit_date(self.git_repo, sha)) is None:
                     warnings.append(f"unable to find revision {sha[:8]} in repo {self.git_repo}")
-                return ""
+                    return ""
+                return date
 
             old_date = commit_date(self.old_revision)
             new_date = commit_date(self.new_revision)
@@ -301,125 +817,147 @@ class RepoChange:
             warnings.append(f"no {missing_revision} revision to compare")
         return warnings
 
-    @cache
+    @cached_property
     def _comparison(self) -> dict[str, object]:
-        with urlopen(self.compare_url()) as r:
-            return json.load(r)
+        return github_get(self.compare_url(), cache_name="compare")
 
     def commits(self) -> dict[str, object]:
-        return self._comparison().get("commits", [])
+        return self._comparison.get("commits", [])
 
 
 def get_changes(old_bundle: Bundle, new_bundle: Bundle) -> list[RepoChange]:
-    images_by_image_repo: dict[str, Image] = {}
-
     # Since the bundles aren't guaranteed to have the same set of images or image order, we can't simply zip the two lists
-    for img in new_bundle.images:
-        images_by_image_repo[img.image_repo] = [img]
-
-    for img in old_bundle.images:
-        if images_by_image_repo.get(img.image_repo):
-            images_by_image_repo[img.image_repo] += [img]
+    old_images_by_image_repo: dict[str, Image] = {img.image_repo: img for img in old_bundle.images}
+
+    # Resolve the upstream commits of the first old/new pair for each code repo concurrently; later pairs are
+    # only needed when an earlier one has no upstream info, so the loop below resolves those on demand
+    first_pairs: dict[str, tuple[Image, Image]] = {}
+    for new_image in new_bundle.images:
+        old_image = old_images_by_image_repo.get(new_image.image_repo)
+        if old_image is not None and old_image.code_repo and new_image.code_repo:
+            first_pairs.setdefault(new_image.code_repo, (old_image, new_image))
+    first_images = [image for pair in first_pairs.values() for image in pair]
+    prefetch_labels(first_images)
+    run_concurrently(Image.upstream_commit, first_images, PODMAN_WORKERS)
 
     changes: dict[str, RepoChange] = {}
 
-    for repo, imgs in images_by_image_repo.items():
-        if len(imgs) != 2:
+    for new_image in new_bundle.images:
+        repo = new_image.image_repo
+        old_image = old_images_by_image_repo.get(repo)
+        if old_image is None:
             logger.warning(f"Skipping image {repo} - missing image to compare")
             continue
 
-        new_image: Image = imgs[0]
-        old_image: Image = imgs[1]
-
         key = new_image.code_repo
 
         if key in changes and changes[key].old_revision is not None and changes[key].new_revision is not None:
             continue
 
-        if None in [old_image.git_link, new_image.git_link, old_image.upstream_commit(), new_image.upstream_commit()]:
+        # Check the code repos first, they're free; the upstream commits may need podman
+        if not (old_image.code_repo and new_image.code_repo and old_image.upstream_commit() and new_image.upstream_commit()):
             logger.warning(f"Skipping image {repo} - no upstream info")
             continue
 
         changes[key] = RepoChange.from_images(old_image, new_image)
 
-    return changes.values()
+    return list(changes.values())
 
 
 def compare(args):
     bundle_name = f"openshift-pipelines-operator-rh.{args.channel}"
-    old_catalog = Catalog(args.old_image)
-    new_catalog = Catalog(args.new_image)
-
-    # TODO: these may need to be different channels in the future
-    old_bundle = old_catalog.get_bundle(bundle_name)
-    new_bundle: Bundle = new_catalog.get_bundle(bundle_name)
-
-    output = {
-        "old_catalog": old_catalog.image,
-        "new_catalog": new_catalog.image,
-        "channel": args.channel,
-        "changes": {}
-    }
-    for change in get_changes(old_bundle, new_bundle):
-        data = None
-        match args.action:
-            case "show-heads":
-                data = {"old_sha": change.old_revision, "new_sha": change.new_revision}
-            case "show-compare-urls":
-                data = {"change_url": change.compare_url()}
-            case "show-all-shas":
-                try:
-                    data = {"commits": [commit.get("sha") for commit in change.commits() if commit.get("sha")]}
-                except Exception as e:
-                    logger.exception(f"Could not get SHAs for image {change.image_name}: {e}")
-            case "show-all-commits":
-                data = {}
-                try:
-                    data = {"commits": [{"sha": commit.get("sha"), "message": commit.get('commit', {}).get("message")} for commit in change.commits()]}
-                except Exception as e:
-                    logger.exception(f"Could not get SHAs for image {change.image_name}: {e}")
-        data["image"] = change.image_name
-        if warnings := change.warnings():
-            data["warning"] = warnings
-
-        output["changes"][change.git_repo] = data
+    old_catalog = None
+    new_catalog = None
+    try:
+        old_catalog = Catalog(args.old_image)
+        new_catalog = Catalog(args.new_image)
+
+        # TODO: these may need to be different channels in the future
+        old_bundle = old_catalog.get_bundle(bundle_name)
+        new_bundle: Bundle = new_catalog.get_bundle(bundle_name)
+
+        output = {
+            "old_catalog": old_catalog.image,
+            "new_catalog": new_catalog.image,
+            "channel": args.channel,
+            "changes": {}
+        }
+        changes = get_changes(old_bundle, new_bundle)
 
-    format = args.output
+        def fetch_github_data(change: RepoChange):
+            change.warnings()
+            if args.action in ("show-all-shas", "show-all-commits"):
+                change.commits()
 
-    if format == "text":
-        print(f"Comparing {output['old_catalog']} to {output['new_catalog']} for {output['channel']}\n---")
+        # Make all the GitHub requests up front so the round trips overlap; errors are reported per change below
+        run_concurrently(fetch_github_data, changes, GITHUB_WORKERS)
 
-        for repo, change in output["changes"].items():
-            print(f"{repo}:")
+        for change in changes:
+            data = None
             match args.action:
                 case "show-heads":
-                    print(f"\told commit: {change['old_sha']}\n\tnew commit: {change['new_sha']}")
+                    data = {"old_sha": change.old_revision, "new_sha": change.new_revision}
                 case "show-compare-urls":
-                    print("\t", change['change_url'])
+                    data = {"change_url": change.compare_url()}
                 case "show-all-shas":
                     try:
-                        for sha in change['commits']:
-                            print("\t" + sha)
+                        data = {"commits": [commit.get("sha") for commit in change.commits() if commit.get("sha")]}
                     except Exception as e:
-                        logger.exception(f"Could not get SHAs for image {change['image']}: {e}")
+                        logger.exception(f"Could not get SHAs for image {change.image_name}: {e}")
                 case "show-all-commits":
+                    data = {}
                     try:
-                        for commit in change['commits']:
-                            message = commit['message'].replace("\n", "\n\t\t")
-                            print(f"\n\t{commit.get('sha')}\n\t\t {message}")
+                        data = {"commits": [{"sha": commit.get("sha"), "message": commit.get('commit', {}).get("message")} for commit in change.commits()]}
                     except Exception as e:
-                        logger.exception(f"Could not get SHAs for image {change['image']}: {e}")
-            if warnings := change.get("warning"):
-                print("\tWarnings:")
-                for w in warnings:
-                    print("\t\t" + w)
-    elif format == "json":
-        print(json.dumps(output, indent=" "))
+                        logger.exception(f"Could not get SHAs for image {change.image_name}: {e}")
+            data["image"] = change.image_name
+            if warnings := change.warnings():
+                data["warning"] = warnings
+
+            output["changes"][change.git_repo] = data
+
+        format = args.output
+
+        if format == "text":
+            print(f"Comparing {output['old_catalog']} to {output['new_catalog']} for {output['channel']}\n---")
+
+            for repo, change in output["changes"].items():
+                print(f"{repo}:")
+                match args.action:
+                    case "show-heads":
+                        print(f"\told commit: {change['old_sha']}\n\tnew commit: {change['new_sha']}")
+                    case "show-compare-urls":
+                        print("\t", change['change_url'])
+                    case "show-all-shas":
+                        try:
+                            for sha in change['commits']:
+                                print("\t" + sha)
+                        except Exception as e:
+                            logger.exception(f"Could not get SHAs for image {change['image']}: {e}")
+                    case "show-all-commits":
+                        try:
+                            for commit in change['commits']:
+                                message = commit['message'].replace("\n", "\n\t\t")
+                                print(f"\n\t{commit.get('sha')}\n\t\t {message}")
+                        except Exception as e:
+                            logger.exception(f"Could not get SHAs for image {change['image']}: {e}")
+                if warnings := change.get("warning"):
+                    print("\tWarnings:")
+                    for w in warnings:
+                        print("\t\t" + w)
+        elif format == "json":
+            json_print(output, indent=True)
+    finally:
+        # the catalogs share Image objects, so whichever is cleaned second has nothing left to do for them
+        for catalog in (old_catalog, new_catalog):
+            if catalog is not None:
+                catalog.clean()
 
 
 def __main__():
     parser = argparse.ArgumentParser("Openshift Pipelines Index inspector")
     parser.add_argument("-v", "--verbose", action='store_true')
+    parser.add_argument("--no-cache", action='store_true', help="ignore cached image, catalog and GitHub data (fresh results are still cached)")
 
     parser.set_defaults(func=None)
     subparses = parser.add_subparsers()
@@ -428,7 +966,7 @@ def __main__():
         ("build-version", "output the index build version and exit"),
         ("full-info", "output image, upstream and downstream source information, and link to upstream source in JSON format"),
         ("list-images", "output list of all images included in the index, by component"),
-        ("validate-images","validate that all images linked in the index exist"),
+        ("validate-images","validate that all images linked in the index exist in their registries"),
     ]:
         subparser = subparses.add_parser(cmd, help=help)
         subparser.set_defaults(command=cmd)
@@ -449,6 +987,10 @@ def __main__():
         logging.basicConfig(level=logging.DEBUG)
         logger.info("Log level set to debug")
 
+    if args.no_cache:
+        global read_cache
+        read_cache = False
+
     if args.func is not None:
         args.func(args)
     else:
@@ -458,11 +1000,11 @@ def __main__():
             bundle = catalog.get_bundle(f"openshift-pipelines-operator-rh.{args.channel}")
 
             if args.command == "full-info":
-                print(json.dumps(bundle.as_dict(show_info=True)))
+                json_print(bundle.as_dict(show_info=True))
             elif args.command == "list-images":
-                print(json.dumps(bundle.as_dict(show_info=False)))
+                json_print(bundle.as_dict(show_info=False))
             elif args.command == "build-version":
-                print(f"Name: {bundle.name}\nVersion: {bundle.version()}")
+                print(f"Name: {bundle.name}\nVersion: {bundle.version}")
             elif args.command == "validate-images":
                 print(bundle.validate_images())
             else:
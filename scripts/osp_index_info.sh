@@ -6,6 +6,7 @@
 
 set -euo pipefail
 
+# Keep in sync with IMAGE_REPO_TO_GIT_REPO in osp_index_info/main.py
 declare -A repositories
 repositories=(
 	["pipelines-cache-rhel9"]="openshift-pipelines/tekton-caches"
@@ -15,7 +16,7 @@ repositories=(
 	["pipelines-controller-rhel9"]="tektoncd/pipeline"
 	["pipelines-entrypoint-rhel9"]="tektoncd/pipeline"
 	["pipelines-events-rhel9"]="tektoncd/pipeline"
-	["pipelines-git-init-rhel9"]="openshift-pipelines/ecosystem-images"
+	["pipelines-git-init-rhel9"]="openshift-pipelines/tektoncd-git-clone"
 	["pipelines-hub-api-rhel9"]="tektoncd/hub"
 	["pipelines-hub-db-migration-rhel9"]="tektoncd/hub"
 	["pipelines-hub-ui-rhel9"]="tektoncd/hub"
@@ -30,12 +31,12 @@ repositories=(
 	["pipelines-pipelines-as-code-controller-rhel9"]="openshift-pipelines/pipelines-as-code"
 	["pipelines-pipelines-as-code-watcher-rhel9"]="openshift-pipelines/pipelines-as-code"
 	["pipelines-pipelines-as-code-webhook-rhel9"]="openshift-pipelines/pipelines-as-code"
-	["pipelines-pruner-controller-rhel9"]="openshift-pipelines/tektoncd-pruner"
+	["pipelines-pruner-controller-rhel9"]="tektoncd/pruner"
 	["pipelines-resolvers-rhel9"]="tektoncd/pipeline"
 	["pipelines-results-api-rhel9"]="tektoncd/results"
 	["pipelines-results-retention-policy-agent-rhel9"]="tektoncd/results"
 	["pipelines-results-watcher-rhel9"]="tektoncd/results"
-	["pipelines-rhel9-operator"]="openshift-pipelines/operator"
+	["pipelines-rhel9-operator"]="tektoncd/operator"
 	["pipelines-sidecarlogresults-rhel9"]="tektoncd/pipeline"
 	["pipelines-triggers-controller-rhel9"]="tektoncd/triggers"
 	["pipelines-triggers-core-interceptors-rhel9"]="tektoncd/triggers"